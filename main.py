@@ -2,12 +2,254 @@ import tkinter as tk
 import asyncio
 import edge_tts
 import speech_recognition as sr
-import pygame
+from faster_whisper import WhisperModel
+import numpy as np
+import sounddevice as sd
+import miniaudio
 import os
 import uuid
+import glob
+import shutil
+import tempfile
 import time
+import threading # Thread dedicada ao loop asyncio, separada do mainloop do Tkinter
+import queue # Passa dados do loop asyncio para outras threads (trechos de MP3, posições a desenhar)
+import io # Buffer em memória para o MP3 recebido do edge_tts
+import unicodedata # Normalização de acentos nos comandos reconhecidos
+import hashlib # Hash do texto para nomear os áudios em cache
 import collections # Importar collections para usar deque para o BFS
-from typing import Tuple, Dict
+import array # Arrays compactos de inteiros para os antecessores do BFS
+import functools # lru_cache para memoizar os caminhos calculados pelo BFS
+import itertools # zip_longest para intercalar as frases de direção por distância
+from typing import Tuple, Dict, Optional, Set
+
+VOZ_TTS = "pt-BR-FranciscaNeural"  # Voz do edge_tts em português (Brasil)
+PASTA_CACHE_TTS = "tts_cache"  # Pasta com os áudios das frases repetidas, reaproveitados entre sessões
+IDADE_PASTA_SESSAO_ABANDONADA = 24 * 60 * 60  # Segundos sem alterações para considerar abandonada a pasta de outra sessão
+TAXA_AMOSTRAGEM_TTS = 24000  # Taxa de amostragem do áudio gerado pelo edge_tts
+TEMPO_MAXIMO_REPRODUCAO = 10  # Segundos máximos de reprodução de uma frase antes de desistir
+INTERVALO_CALIBRACAO = 300  # Segundos entre recalibrações do ruído ambiente do microfone
+MODELO_WHISPER = "tiny"  # Modelo local do faster-whisper; "base" é mais preciso, porém mais lento
+TAXA_AMOSTRAGEM_ASR = 16000  # Taxa de amostragem esperada pelo Whisper
+INTERVALO_CANVAS_MS = 50  # Intervalo com que a thread do Tkinter aplica as posições recebidas do assistente
+
+# Instruções de cada direção (dx, dy) no mapa; o "{}" recebe a quantidade de passos
+INSTRUCOES_DIRECAO = {
+    (1, 0): "Siga {} para a direita",
+    (-1, 0): "Siga {} para a esquerda",
+    (0, 1): "Siga {} em frente",
+    (0, -1): "Volte {}",
+}
+
+# Frases fixas faladas muitas vezes por sessão; são sintetizadas uma única vez e lidas do disco depois
+FRASES_FIXAS = (
+    "Você chegou ao seu destino.",
+    "Assistente ativado. Qual produto você quer encontrar?",
+    "Produto não encontrado ou comando inválido. Tente novamente.",
+)
+
+
+def _caminho_cache_tts(texto: str) -> str:
+    """
+    Retorna o caminho do áudio em cache para o texto, identificado pelo hash de (voz, texto).
+    """
+    chave = hashlib.sha1((VOZ_TTS + texto).encode("utf-8")).hexdigest()
+    return os.path.join(PASTA_CACHE_TTS, f"{chave}.mp3")
+
+
+def _frase_direcao(direcao: Tuple[int, int], passos: int) -> str:
+    """
+    Monta a instrução de voz para um trecho reto do caminho, ex.: "Siga 4 passos para a direita".
+    """
+    quantidade = "1 passo" if passos == 1 else f"{passos} passos"
+    return INSTRUCOES_DIRECAO[direcao].format(quantidade)
+
+
+def _ler_arquivo(caminho: str) -> bytes:
+    """
+    Lê um arquivo inteiro (usado no executor, para não bloquear o loop asyncio com o disco).
+    """
+    with open(caminho, "rb") as arquivo:
+        return arquivo.read()
+
+
+def _decodificar_mp3(mp3: bytes) -> np.ndarray:
+    """
+    Decodifica o MP3 do edge_tts, uma única vez, para PCM int16 mono pronto para tocar.
+    """
+    decodificado = miniaudio.decode(
+        mp3,
+        output_format=miniaudio.SampleFormat.SIGNED16,
+        nchannels=1,
+        sample_rate=TAXA_AMOSTRAGEM_TTS,
+    )
+    return np.frombuffer(decodificado.samples, dtype=np.int16)
+
+
+def _tocar_pcm_bloqueante(pcm: np.ndarray):
+    """
+    Toca o PCM pelo sounddevice e bloqueia até o fim da reprodução.
+    """
+    sd.play(pcm, samplerate=TAXA_AMOSTRAGEM_TTS)
+    sd.wait()
+
+
+class _FonteMp3Progressiva(miniaudio.StreamableSource):
+    """
+    Fonte do decodificador do miniaudio alimentada com os trechos de MP3 à medida que o edge_tts os envia.
+    read() roda na thread da reprodução e bloqueia até haver bytes suficientes ou o download terminar.
+    """
+    def __init__(self):
+        self.partes = queue.Queue()  # Trechos de MP3 recebidos; None marca o fim do download
+        self.buffer = bytearray()
+        self.terminou = False
+
+    def adicionar(self, dados: Optional[bytes]):
+        """
+        Entrega um trecho de MP3 ao decodificador (None encerra o áudio). Chamado pelo loop asyncio.
+        """
+        self.partes.put(dados)
+
+    def read(self, num_bytes: int) -> bytes:
+        while len(self.buffer) < num_bytes and not self.terminou:
+            parte = self.partes.get()
+            if parte is None:
+                self.terminou = True
+            else:
+                self.buffer += parte
+        dados = bytes(self.buffer[:num_bytes])
+        del self.buffer[:num_bytes]
+        return dados
+
+
+def _tocar_mp3_progressivo_bloqueante(fonte: _FonteMp3Progressiva, interromper: threading.Event):
+    """
+    Decodifica o MP3 aos poucos, conforme chega, e toca cada bloco de PCM assim que fica pronto.
+    Bloqueia até o fim do áudio ou até interromper ser sinalizado.
+    """
+    blocos = miniaudio.stream_any(
+        fonte,
+        source_format=miniaudio.FileFormat.MP3,
+        output_format=miniaudio.SampleFormat.SIGNED16,
+        nchannels=1,
+        sample_rate=TAXA_AMOSTRAGEM_TTS,
+    )
+    with sd.OutputStream(samplerate=TAXA_AMOSTRAGEM_TTS, channels=1, dtype="int16") as saida:
+        for bloco in blocos:
+            if interromper.is_set():
+                saida.abort()  # Descarta o áudio ainda não tocado
+                break
+            saida.write(np.frombuffer(bloco, dtype=np.int16))
+
+
+def _vizinhos(indice: int, largura: int, total: int):
+    """
+    Retorna os índices das células vizinhas (baixo, cima, direita, esquerda)
+    dentro do mapa, sem atravessar as bordas laterais.
+    """
+    x = indice % largura
+    vizinhos = []
+    if indice + largura < total:
+        vizinhos.append(indice + largura)
+    if indice - largura >= 0:
+        vizinhos.append(indice - largura)
+    if x + 1 < largura:
+        vizinhos.append(indice + 1)
+    if x > 0:
+        vizinhos.append(indice - 1)
+    return vizinhos
+
+
+@functools.lru_cache(maxsize=512)
+def _caminho_mais_curto(passavel: bytes, largura: int, altura: int,
+                        origem: int, alvo: int) -> Optional[Tuple[int, ...]]:
+    """
+    Executa um BFS bidirecional sobre o mapa de passagem e retorna o caminho mais curto
+    (em índices de célula) de origem até alvo, incluindo ambos, ou None se não houver caminho.
+    As duas buscas (a partir do início e do destino) avançam uma camada por vez, sempre pela
+    fronteira menor, até se encontrarem; em mapas grandes isso explora bem menos células.
+    O resultado é memoizado por (mapa, origem, alvo), já que o mapa não muda durante a sessão.
+    """
+    # Cada lado guarda a distância e o antecessor de cada célula em arrays
+    total = largura * altura
+    if origem == alvo:
+        return (origem,)
+
+    dist_ida = array.array('i', [-1]) * total
+    dist_volta = array.array('i', [-1]) * total
+    parent_ida = array.array('i', [-1]) * total
+    parent_volta = array.array('i', [-1]) * total
+    dist_ida[origem] = 0
+    dist_volta[alvo] = 0
+    fronteira_ida = collections.deque([origem])
+    fronteira_volta = collections.deque([alvo])
+
+    while fronteira_ida and fronteira_volta:
+        # Expande uma camada inteira da fronteira menor
+        if len(fronteira_ida) <= len(fronteira_volta):
+            fronteira, dist, parent, dist_outro = fronteira_ida, dist_ida, parent_ida, dist_volta
+        else:
+            fronteira, dist, parent, dist_outro = fronteira_volta, dist_volta, parent_volta, dist_ida
+
+        # Entre os encontros desta camada, fica com o de menor comprimento total
+        melhor = None  # (comprimento, célula deste lado, célula do outro lado)
+        for _ in range(len(fronteira)):
+            atual = fronteira.popleft()
+            for vizinho in _vizinhos(atual, largura, total):
+                if not passavel[vizinho]:
+                    continue
+                if dist_outro[vizinho] != -1:
+                    comprimento = dist[atual] + 1 + dist_outro[vizinho]
+                    if melhor is None or comprimento < melhor[0]:
+                        melhor = (comprimento, atual, vizinho)
+                elif dist[vizinho] == -1:
+                    dist[vizinho] = dist[atual] + 1
+                    parent[vizinho] = atual
+                    fronteira.append(vizinho)
+
+        if melhor is not None:
+            _, celula, celula_outro = melhor
+            if dist is dist_volta:
+                celula, celula_outro = celula_outro, celula
+            # Metade da ida: segue os antecessores até a origem e inverte
+            caminho = []
+            while celula != -1:
+                caminho.append(celula)
+                celula = parent_ida[celula]
+            caminho.reverse()
+            # Metade da volta: segue os antecessores até o destino
+            while celula_outro != -1:
+                caminho.append(celula_outro)
+                celula_outro = parent_volta[celula_outro]
+            return tuple(caminho)
+
+    return None
+
+
+def _tabela_proximo_passo(passavel: bytes, largura: int, altura: int, alvo: int) -> array.array:
+    """
+    Executa um único BFS a partir do alvo e retorna um array indexado por célula com
+    a célula vizinha que leva um passo mais perto dele pelo caminho mais curto
+    (-1 para o próprio alvo e para células que não o alcançam).
+    """
+    visited = bytearray(largura * altura)
+    fila = collections.deque([alvo])
+    visited[alvo] = 1
+    proximo_passo = array.array('i', [-1]) * (largura * altura)
+
+    while fila:
+        atual = fila.popleft()
+
+        # Possíveis movimentos: baixo, cima, direita, esquerda (sem atravessar as bordas do mapa)
+        for vizinho in _vizinhos(atual, largura, len(passavel)):
+            if passavel[vizinho] and not visited[vizinho]:
+                visited[vizinho] = 1
+                # Quem está no vizinho chega mais perto do destino andando para a célula atual
+                proximo_passo[vizinho] = atual
+                fila.append(vizinho)
+
+    return proximo_passo
+
 
 class SupermercadoComAssistente:
     """
@@ -17,7 +259,7 @@ class SupermercadoComAssistente:
     def __init__(self):
         """
         Inicializa a janela do Tkinter, o canvas, as configurações do mapa,
-        e os componentes do assistente de voz (pygame, speech_recognition, edge_tts).
+        e os componentes do assistente de voz (sounddevice, speech_recognition, faster-whisper, edge_tts).
         """
         # Configurações da janela Tkinter
         self.janela = tk.Tk()
@@ -29,9 +271,23 @@ class SupermercadoComAssistente:
         self.tamanho_celula = 40
         self.largura = 18  # Células de largura
         self.altura = 15   # Células de altura
+        # Tabela das instruções de voz por direção, indexada por (passos - 1): montadas uma única vez,
+        # são as mesmas frases pré-sintetizadas e guardadas no cache de áudio.
+        # A direção é a diferença entre os índices de duas células vizinhas (dx + dy * largura).
+        # Cada direção vai só até o maior trecho reto possível no seu eixo (largura - 1 ou altura - 1)
+        self.instrucoes_direcao: Dict[int, Tuple[str, ...]] = {
+            dx + dy * self.largura: tuple(
+                _frase_direcao((dx, dy), passos)
+                for passos in range(1, (self.largura if dx else self.altura))
+            )
+            for dx, dy in INSTRUCOES_DIRECAO
+        }
 
-        self.prateleiras = set()  # Armazena as coordenadas das prateleiras (agora obstáculos)
-        self.produtos: Dict[str, Tuple[int, int]] = {
+        # As células do mapa são identificadas por um único inteiro (y * largura + x);
+        # as coordenadas (x, y) só são usadas para declarar o mapa e para desenhá-lo
+        self.prateleiras: Set[int] = set()  # Armazena as células das prateleiras (agora obstáculos)
+        self.passavel = b""  # Mapa de passagem (1 = livre, 0 = prateleira), indexado pela célula
+        coordenadas_produtos = {
             # Produtos e suas coordenadas no mapa
             "arroz": (2, 2),
             "feijao": (2, 3),
@@ -43,14 +299,65 @@ class SupermercadoComAssistente:
             "queijo": (11, 13),
             "manteiga": (14, 12),
         }
-
-        self.posicao_atual = (0, 0)  # Posição inicial do usuário no mapa
+        self.produtos: Dict[str, int] = {
+            nome: self._indice(x, y) for nome, (x, y) in coordenadas_produtos.items()
+        }
+        self.celulas_produtos = set(self.produtos.values())  # Para colorir o mapa sem percorrer os produtos
+
+        # Índices para reconhecer produtos no comando: nomes de uma palavra em um conjunto (busca O(1))
+        # e nomes compostos, raros, verificados por substring
+        self.produto_set = {nome for nome in self.produtos if " " not in nome}
+        self.produtos_compostos = [nome for nome in self.produtos if " " in nome]
+
+        self.posicao_atual = self._indice(0, 0)  # Posição inicial do usuário no mapa
+        self.posicao_desenhada = self.posicao_atual  # Célula pintada de azul no canvas
+        self.celulas_canvas = []  # Retângulos do canvas por célula, criados em desenhar_mapa
+        # Posições enviadas pelo loop asyncio e desenhadas pela thread do Tkinter, a única que mexe no canvas
+        self.fila_canvas = queue.Queue()
+        self.agendamento_canvas = None  # Id do janela.after que esvazia fila_canvas
+        # Rotas pré-calculadas: destino acessível -> array[célula] = próxima célula em direção ao destino
+        self.proximo_passo: Dict[int, array.array] = {}
 
         # Configurações do assistente de voz
-        pygame.mixer.init()  # Inicializa o mixer do pygame para reprodução de áudio
-        self.recognizer = sr.Recognizer()  # Inicializa o reconhecedor de fala
+        self.recognizer = sr.Recognizer()  # Captura a fala do microfone (detecção de voz por energia)
+        # Reconhecimento de fala local, sem a ida e volta de rede do Google. O modelo é carregado
+        # (e baixado, na primeira execução) fora da thread do Tkinter, por _carregar_modelo_whisper
+        self.modelo_whisper = None
+        self.modelo_whisper_lock = threading.Lock()  # Evita dois carregamentos simultâneos do modelo
+        self.ultima_calibracao: Optional[float] = None  # Momento (time.monotonic) da última calibração do ruído ambiente
+        # Abre o microfone uma única vez e o mantém aberto entre os comandos,
+        # evitando reabrir o dispositivo (PortAudio) a cada escuta
+        self.microfone = None  # None se o PyAudio ou o dispositivo de entrada não estiverem disponíveis
+        self.fonte_microfone = None  # Fonte de áudio aberta, reutilizada por ouvir_comando
+        # Mantido por ouvir_comando enquanto lê o microfone; o fechamento só acontece com ele livre
+        self.microfone_lock = threading.Lock()
+        self.encerrando = False  # Sinaliza a ouvir_comando que o microfone deve ser fechado ao fim da escuta
+        try:
+            self.microfone = sr.Microphone()
+            self.fonte_microfone = self.microfone.__enter__()
+            # Calibra o ruído ambiente uma única vez; o limiar de energia fica guardado no reconhecedor
+            self.calibrar_microfone(self.fonte_microfone, duracao=1.5)
+        except Exception as e:
+            print(f"[ERRO MIC] Não foi possível abrir ou calibrar o microfone: {e}")
         self.audio_lock = asyncio.Lock()  # Bloqueio para evitar sobreposição de áudio
-        self.arquivos_temp = set()  # Conjunto para rastrear arquivos de áudio temporários
+        # Sinal de parada da reprodução progressiva em andamento; cada reprodução recebe o seu,
+        # para que o sinal dado a uma reprodução antiga nunca seja desfeito pela seguinte
+        self.interromper_reproducao = threading.Event()
+        self.audios_pcm: Dict[str, np.ndarray] = {}  # Frases repetidas já decodificadas, prontas para tocar
+        self.frases_cache = set(self._frases_repetidas())  # Frases que vão para a pasta de cache
+        # Arquivos parciais da sessão ficam em uma única pasta, apagada de uma vez ao fechar;
+        # pastas de sessões encerradas de forma inesperada são removidas agora, mas só as paradas
+        # há muito tempo, para não apagar a pasta de outra instância aberta ao mesmo tempo
+        os.makedirs(PASTA_CACHE_TTS, exist_ok=True)
+        agora = time.time()
+        for pasta_antiga in glob.glob(os.path.join(PASTA_CACHE_TTS, "sessao_*")):
+            try:
+                abandonada = agora - os.path.getmtime(pasta_antiga) > IDADE_PASTA_SESSAO_ABANDONADA
+            except OSError:
+                continue  # Já removida por outra instância
+            if abandonada:
+                shutil.rmtree(pasta_antiga, ignore_errors=True)
+        self.pasta_temp = tempfile.mkdtemp(prefix="sessao_", dir=PASTA_CACHE_TTS)
 
         # Botão para iniciar o assistente de voz
         self.btn_iniciar_assistente = tk.Button(
@@ -60,38 +367,79 @@ class SupermercadoComAssistente:
         )
         self.btn_iniciar_assistente.pack(pady=10)
 
-        # Inicializa o loop de eventos do asyncio explicitamente
+        # Inicializa o loop de eventos do asyncio em uma thread própria, rodando continuamente,
+        # para que timers e sockets funcionem normalmente sem disputar o mainloop do Tkinter
         self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop) # Define este loop como o loop atual para este thread
+        self.thread_loop = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread_loop.start()
+        # Execução atual do assistente; só uma por vez, pois todas dividiriam o mesmo microfone e modelo
+        self.futuro_assistente = None
 
         self.janela.protocol("WM_DELETE_WINDOW", self.on_closing) # Garante o fechamento correto da janela
 
     def _start_assistant_task(self):
         """
         Método auxiliar para iniciar a tarefa do assistente no loop asyncio.
-        Isso permite que a tarefa assíncrona seja agendada sem bloquear o Tkinter.
+        Isso permite que a tarefa assíncrona seja agendada, a partir da thread do Tkinter, sem bloqueá-lo.
+        Cliques enquanto o assistente já está em execução são ignorados.
         """
-        self.loop.create_task(self.executar_assistente())
+        if self.futuro_assistente is not None and not self.futuro_assistente.done():
+            print("[ASSISTENTE] O assistente já está em execução.")
+            return
+        self.futuro_assistente = asyncio.run_coroutine_threadsafe(self.executar_assistente(), self.loop)
 
     def on_closing(self):
         """
-        Lida com o evento de fechamento da janela, garantindo que os recursos
-        do Pygame sejam liberados e arquivos temporários sejam removidos.
-        Também garante que o loop asyncio seja parado e fechado corretamente.
+        Lida com o evento de fechamento da janela, garantindo que a reprodução
+        de áudio em andamento seja interrompida, o microfone seja fechado
+        e os arquivos temporários sejam removidos.
+        O loop asyncio é parado (com as tarefas canceladas) antes de destruir a janela.
         """
-        pygame.mixer.quit()
-        for arquivo in list(self.arquivos_temp):
-            if os.path.exists(arquivo):
-                os.remove(arquivo)
+        sd.stop()
+        self.interromper_reproducao.set()
+        # Cancela as tarefas pendentes e para o loop asyncio, na thread dele
+        try:
+            asyncio.run_coroutine_threadsafe(self._cancelar_tarefas(), self.loop).result(timeout=1)
+        except Exception as e:
+            print(f"[ERRO] Não foi possível cancelar as tarefas do assistente: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread_loop.join(timeout=1)
+        if not self.loop.is_running():
+            self.loop.close()
+        # Fecha o microfone agora se ninguém o estiver lendo; caso contrário, ouvir_comando
+        # o fecha na própria thread ao fim da escuta, nunca durante a leitura do stream
+        self.encerrando = True
+        if self.microfone_lock.acquire(blocking=False):
+            try:
+                self._fechar_microfone()
+            finally:
+                self.microfone_lock.release()
+        shutil.rmtree(self.pasta_temp, ignore_errors=True)  # Remove de uma vez os arquivos temporários da sessão
+        if self.agendamento_canvas is not None:
+            self.janela.after_cancel(self.agendamento_canvas)
         self.janela.destroy()
-        # Para o loop asyncio suavemente
-        if self.loop.is_running():
-            self.loop.stop()
-        # Cancela todas as tarefas pendentes antes de fechar o loop
-        for task in asyncio.all_tasks(self.loop):
+
+    async def _cancelar_tarefas(self):
+        """
+        Executado na thread do loop asyncio: cancela todas as outras tarefas e espera que terminem.
+        """
+        tarefas = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tarefas:
             task.cancel()
-        self.loop.close()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+
+
+    def _indice(self, x: int, y: int) -> int:
+        """
+        Converte coordenadas (x, y) no identificador inteiro da célula.
+        """
+        return y * self.largura + x
 
+    def _coordenadas(self, celula: int) -> Tuple[int, int]:
+        """
+        Converte o identificador da célula de volta em coordenadas (x, y), para desenhar.
+        """
+        return celula % self.largura, celula // self.largura
 
     def adicionar_prateleiras(self):
         """
@@ -101,44 +449,78 @@ class SupermercadoComAssistente:
         """
         for x in range(2, self.largura - 2, 3):  # Colunas das prateleiras
             for y in range(1, self.altura - 1):  # Linhas das prateleiras
-                self.prateleiras.add((x, y))
+                self.prateleiras.add(self._indice(x, y))
+
+        # Pré-calcula o mapa de passagem usado pelo BFS, evitando consultas ao conjunto a cada vizinho
+        passavel = bytearray(b"\x01") * (self.largura * self.altura)
+        for celula in self.prateleiras:
+            passavel[celula] = 0
+        self.passavel = bytes(passavel)  # Imutável, para servir de chave no cache de caminhos
+
+    def _destino_acessivel(self, destino: int) -> Optional[int]:
+        """
+        Retorna a célula onde o usuário deve parar para alcançar o destino.
+        Se o produto está em uma prateleira, usa a primeira célula adjacente não-prateleira;
+        retorna None se nenhuma for acessível.
+        """
+        if destino not in self.prateleiras:
+            return destino
+
+        # Tentar encontrar uma célula adjacente válida (não-prateleira): baixo, cima, direita, esquerda
+        for vizinho in _vizinhos(destino, self.largura, self.largura * self.altura):
+            if vizinho not in self.prateleiras:
+                return vizinho
+        return None
+
+    def calcular_rotas(self):
+        """
+        Pré-calcula, uma única vez, as rotas de todas as células livres até cada produto.
+        Como o mapa e os produtos são estáticos, a navegação passa a ser uma consulta à tabela.
+        """
+        self.proximo_passo = {}
+        for celula in self.produtos.values():
+            final_destination = self._destino_acessivel(celula)
+            if final_destination is not None and final_destination not in self.proximo_passo:
+                self.proximo_passo[final_destination] = _tabela_proximo_passo(
+                    self.passavel, self.largura, self.altura, final_destination
+                )
+
+    def _cor_base(self, celula: int) -> str:
+        """
+        Retorna a cor de uma célula sem considerar a posição do usuário.
+        O produto tem prioridade visual sobre a prateleira em que está.
+        """
+        if celula in self.celulas_produtos:
+            return "orange"  # Cor para os produtos
+        if celula in self.prateleiras:
+            return "grey"  # Cor para as prateleiras (obstáculos)
+        return "white"  # Cor padrão para células vazias
 
     def desenhar_mapa(self):
         """
-        Desenha o mapa no canvas do Tkinter, incluindo a posição atual do usuário,
-        as prateleiras e os produtos.
+        Desenha o mapa completo no canvas do Tkinter, incluindo a posição atual do usuário,
+        as prateleiras e os produtos. Chamado uma única vez; os movimentos usam atualizar_posicao.
         """
-        self.canvas.delete("all")  # Limpa o canvas antes de redesenhar
+        self.canvas.delete("all")  # Limpa o canvas antes de desenhar
 
+        self.celulas_canvas = []  # Célula -> id do retângulo no canvas (percorrido na ordem y * largura + x)
         for y in range(self.altura):
             for x in range(self.largura):
-                cor = "white"  # Cor padrão para células vazias
-                if (x, y) == self.posicao_atual:
-                    cor = "blue"  # Cor para a posição atual do usuário
-                elif (x, y) in self.prateleiras:
-                    cor = "grey"  # Cor para as prateleiras (obstáculos)
-                elif (x, y) in self.produtos.values():
-                    cor = "orange"  # Cor para os produtos
-                
-                # Se a posição atual for um produto, mas também uma prateleira, o produto tem prioridade visual
-                if (x, y) == self.posicao_atual:
-                    cor = "blue"
-                elif (x, y) in self.produtos.values():
-                    cor = "orange"
-                elif (x, y) in self.prateleiras:
-                    cor = "grey"
-
-                self.canvas.create_rectangle(
+                celula = self._indice(x, y)
+                cor = "blue" if celula == self.posicao_atual else self._cor_base(celula)
+                self.celulas_canvas.append(self.canvas.create_rectangle(
                     x * self.tamanho_celula,
                     y * self.tamanho_celula,
                     (x + 1) * self.tamanho_celula,
                     (y + 1) * self.tamanho_celula,
                     fill=cor,
                     outline="black"
-                )
+                ))
+        self.posicao_desenhada = self.posicao_atual
 
         # Desenha os nomes dos produtos no mapa
-        for nome, (x, y) in self.produtos.items():
+        for nome, celula in self.produtos.items():
+            x, y = self._coordenadas(celula)
             self.canvas.create_text(
                 x * self.tamanho_celula + self.tamanho_celula // 2,
                 y * self.tamanho_celula + self.tamanho_celula // 2,
@@ -149,160 +531,365 @@ class SupermercadoComAssistente:
 
         self.janela.update_idletasks()  # Atualiza a janela imediatamente
 
+    def atualizar_posicao(self, posicao: int):
+        """
+        Atualiza no canvas apenas as duas células afetadas por um movimento:
+        a posição anterior volta à sua cor original e a nova fica azul.
+        Deve rodar na thread do Tkinter (chamado por _aplicar_posicoes).
+        """
+        if self.posicao_desenhada == posicao:
+            return
+        self.canvas.itemconfig(
+            self.celulas_canvas[self.posicao_desenhada], fill=self._cor_base(self.posicao_desenhada)
+        )
+        self.canvas.itemconfig(self.celulas_canvas[posicao], fill="blue")
+        self.posicao_desenhada = posicao
+
+    def _aplicar_posicoes(self):
+        """
+        Executado periodicamente na thread do Tkinter: desenha as posições que o assistente
+        colocou em fila_canvas, para que o loop asyncio nunca acesse o Tkinter diretamente.
+        """
+        try:
+            while True:
+                self.atualizar_posicao(self.fila_canvas.get_nowait())
+        except queue.Empty:
+            pass
+        self.agendamento_canvas = self.janela.after(INTERVALO_CANVAS_MS, self._aplicar_posicoes)
+
     async def sintetizar_voz(self, texto: str):
         """
         Sintetiza o texto fornecido em fala e o reproduz.
+        Frases que ainda não estão em cache começam a tocar enquanto o áudio é baixado.
         Usa um bloqueio para garantir que apenas um áudio seja reproduzido por vez.
         """
         async with self.audio_lock:
             try:
                 print(f"[VOZ] {texto}")
-                audio_file = f"temp_{uuid.uuid4().hex}.mp3"  # Gera um nome de arquivo único
-                self.arquivos_temp.add(audio_file)
-                # Usa edge_tts para converter texto em fala em português (Brasil)
-                communicate = edge_tts.Communicate(texto, "pt-BR-FranciscaNeural")
-                await communicate.save(audio_file)
+                if texto in self.audios_pcm or os.path.exists(_caminho_cache_tts(texto)):
+                    pcm = await self.gerar_audio(texto)
+                    await self._tocar_pcm(pcm)
+                else:
+                    await self._falar_progressivo(texto)
+            except Exception as e:
+                print(f"[ERRO VOZ] Ocorreu um erro ao sintetizar a voz: {e}")
+
+    async def gerar_audio(self, texto: str) -> np.ndarray:
+        """
+        Apenas sintetiza o texto (sem reproduzir) e retorna o áudio como PCM int16 mono.
+        O MP3 do edge_tts é recebido em memória e decodificado uma única vez; frases repetidas
+        também são guardadas na pasta de cache e mantidas decodificadas em memória.
+        Não usa o bloqueio de áudio, então pode rodar enquanto outra frase toca ou o microfone escuta.
+        A leitura do disco, a gravação no cache e a decodificação rodam no executor, sem travar o loop.
+        """
+        pcm = self.audios_pcm.get(texto)
+        if pcm is not None:
+            return pcm
+
+        audio_cache = _caminho_cache_tts(texto)
+        if os.path.exists(audio_cache):
+            mp3 = await self.loop.run_in_executor(None, _ler_arquivo, audio_cache)
+        else:
+            # Usa edge_tts para converter texto em fala em português (Brasil), recebendo o áudio em partes
+            buffer = io.BytesIO()
+            async for chunk in edge_tts.Communicate(texto, VOZ_TTS).stream():
+                if chunk["type"] == "audio":
+                    buffer.write(chunk["data"])
+            mp3 = buffer.getvalue()
+            if texto in self.frases_cache:
+                await self.loop.run_in_executor(None, self._salvar_no_cache, texto, mp3)
+
+        pcm = await self.loop.run_in_executor(None, _decodificar_mp3, mp3)
+        if texto in self.frases_cache:
+            self.audios_pcm[texto] = pcm
+        return pcm
+
+    def _salvar_no_cache(self, texto: str, mp3: bytes):
+        """
+        Grava o MP3 de uma frase repetida na pasta de cache.
+        Salva na pasta temporária da sessão e move ao final (os.replace é atômico),
+        para nunca expor um arquivo incompleto no cache.
+        """
+        os.makedirs(self.pasta_temp, exist_ok=True)  # Recria a pasta se outra instância a removeu
+        parcial = os.path.join(self.pasta_temp, f"{uuid.uuid4().hex}.mp3")
+        with open(parcial, "wb") as arquivo:
+            arquivo.write(mp3)
+        os.replace(parcial, _caminho_cache_tts(texto))
 
-                pygame.mixer.music.load(audio_file)  # Carrega o arquivo de áudio
-                pygame.mixer.music.play()  # Inicia a reprodução
+    async def _falar_progressivo(self, texto: str):
+        """
+        Sintetiza e reproduz o texto ao mesmo tempo: cada trecho de MP3 recebido do edge_tts
+        vai direto para a thread de reprodução, que o decodifica e toca sem esperar o download terminar.
+        O áudio completo só é guardado quando a frase vai para a pasta de cache.
+        """
+        fonte = _FonteMp3Progressiva()
+        interromper = threading.Event()
+        self.interromper_reproducao = interromper  # Permite que on_closing pare esta reprodução
+        reproducao = self.loop.run_in_executor(
+            None, _tocar_mp3_progressivo_bloqueante, fonte, interromper
+        )
+        buffer = io.BytesIO() if texto in self.frases_cache else None
+        try:
+            async for chunk in edge_tts.Communicate(texto, VOZ_TTS).stream():
+                if chunk["type"] == "audio":
+                    fonte.adicionar(chunk["data"])
+                    if buffer is not None:
+                        buffer.write(chunk["data"])
+        finally:
+            fonte.adicionar(None)  # Fim (ou falha) do download: a reprodução termina com o que recebeu
+            try:
+                await asyncio.wait_for(reproducao, timeout=TEMPO_MAXIMO_REPRODUCAO)
+            except asyncio.TimeoutError:
+                interromper.set()  # Libera a thread do executor que estava tocando
+                print("[ERRO VOZ] A reprodução excedeu o tempo limite e foi interrompida.")
 
-                while pygame.mixer.music.get_busy():
-                    await asyncio.sleep(0.1)  # Espera a reprodução terminar
+        if buffer is not None:
+            mp3 = buffer.getvalue()
+            await self.loop.run_in_executor(None, self._salvar_no_cache, texto, mp3)
+            self.audios_pcm[texto] = await self.loop.run_in_executor(None, _decodificar_mp3, mp3)
 
-                await self._remover_arquivo_seguro(audio_file)  # Remove o arquivo temporário
+    async def reproduzir_audio(self, texto: str, pcm: np.ndarray):
+        """
+        Reproduz um áudio já gerado por gerar_audio.
+        Usa o mesmo bloqueio de sintetizar_voz para não sobrepor falas.
+        """
+        async with self.audio_lock:
+            try:
+                print(f"[VOZ] {texto}")
+                await self._tocar_pcm(pcm)
             except Exception as e:
-                print(f"[ERRO VOZ] Ocorreu um erro ao sintetizar a voz: {e}")
+                print(f"[ERRO VOZ] Ocorreu um erro ao reproduzir a voz: {e}")
+
+    async def falar_preparado(self, texto: str, tarefa: "asyncio.Task[np.ndarray]"):
+        """
+        Aguarda uma síntese iniciada antes (com gerar_audio) e reproduz o resultado.
+        Se a síntese antecipada falhou, sintetiza e fala o texto normalmente.
+        """
+        try:
+            pcm = await tarefa
+        except Exception as e:
+            print(f"[ERRO VOZ] Falha na síntese antecipada: {e}")
+            await self.sintetizar_voz(texto)
+            return
+        await self.reproduzir_audio(texto, pcm)
+
+    async def _tocar_pcm(self, pcm: np.ndarray):
+        """
+        Envia o PCM direto para a placa de som e aguarda o fim da reprodução.
+        A reprodução bloqueante roda em uma thread do executor, sem travar o loop asyncio,
+        e é interrompida se passar de TEMPO_MAXIMO_REPRODUCAO.
+        """
+        try:
+            await asyncio.wait_for(
+                self.loop.run_in_executor(None, _tocar_pcm_bloqueante, pcm),
+                timeout=TEMPO_MAXIMO_REPRODUCAO,
+            )
+        except asyncio.TimeoutError:
+            sd.stop()  # Libera a thread do executor que estava em sd.wait()
+            print("[ERRO VOZ] A reprodução excedeu o tempo limite e foi interrompida.")
+
+    def _frases_repetidas(self) -> Tuple[str, ...]:
+        """
+        Retorna as frases ditas repetidamente na sessão (instruções de cada direção e distância,
+        chegada e avisos de cada produto), que valem a pena manter na pasta de cache.
+        """
+        frases = list(FRASES_FIXAS)
+        # Trechos curtos primeiro; as direções horizontais e verticais têm tamanhos diferentes
+        for frases_por_distancia in itertools.zip_longest(*self.instrucoes_direcao.values()):
+            frases.extend(frase for frase in frases_por_distancia if frase is not None)
+        for produto_nome in self.produtos:
+            frases.append(f"{produto_nome} encontrado. Direcionando você agora.")
+            frases.append(f"Você chegou ao {produto_nome}. Deseja outro item?")
+        return tuple(frases)
+
+    async def pre_sintetizar_frases(self):
+        """
+        Sintetiza uma única vez as frases repetidas (direções, chegada e avisos de cada produto)
+        e as guarda na pasta de cache, para que sintetizar_voz as reproduza sem acessar a rede.
+        """
+        for texto in self._frases_repetidas():
+            try:
+                await self.gerar_audio(texto)
+            except Exception as e:
+                print(f"[ERRO VOZ] Não foi possível pré-sintetizar \"{texto}\": {e}")
+
+    def calibrar_microfone(self, source, duracao: float):
+        """
+        Ajusta o limiar de energia do reconhecedor ao ruído ambiente captado pelo microfone.
+        """
+        self.recognizer.adjust_for_ambient_noise(source, duration=duracao)
+        self.ultima_calibracao = time.monotonic()
+        print(f"[MIC] Limiar de energia calibrado: {self.recognizer.energy_threshold:.0f}")
 
-    async def _remover_arquivo_seguro(self, arquivo: str):
+    def _fechar_microfone(self):
         """
-        Remove um arquivo de áudio temporário de forma segura após um pequeno atraso.
+        Fecha o microfone aberto em __init__. Deve ser chamado com microfone_lock adquirido.
         """
-        await asyncio.sleep(0.5)  # Pequeno atraso para garantir que o arquivo não esteja em uso
+        if self.fonte_microfone is None:
+            return
         try:
-            if os.path.exists(arquivo):
-                # Descarrega o áudio antes de remover o arquivo
-                if pygame.mixer.music.get_busy():
-                    pygame.mixer.music.stop()
-                pygame.mixer.music.unload()
-                os.remove(arquivo)
-                self.arquivos_temp.discard(arquivo) # Remove do conjunto de arquivos temporários
+            self.microfone.__exit__(None, None, None)
         except Exception as e:
-            print(f"[ERRO ARQUIVO] Ocorreu um erro ao remover o arquivo: {e}")
+            print(f"[ERRO MIC] Ocorreu um erro ao fechar o microfone: {e}")
+        self.fonte_microfone = None
+
+    def _escutar(self):
+        """
+        Calibra (se necessário) e grava uma fala do microfone, com microfone_lock adquirido.
+        Retorna None se o microfone estiver indisponível. Se a janela foi fechada durante a
+        escuta, fecha o microfone aqui mesmo, na thread que o estava lendo.
+        """
+        with self.microfone_lock:
+            source = self.fonte_microfone
+            if source is None or self.encerrando:
+                return None
+            try:
+                # Recalibra o ruído ambiente apenas de tempos em tempos, não a cada comando
+                if (self.ultima_calibracao is None or
+                    time.monotonic() - self.ultima_calibracao > INTERVALO_CALIBRACAO):
+                    self.calibrar_microfone(source, duracao=0.8)
+                # Ouve o áudio do microfone
+                return self.recognizer.listen(source, timeout=4, phrase_time_limit=5)
+            finally:
+                if self.encerrando:
+                    self._fechar_microfone()
+
+    def _carregar_modelo_whisper(self):
+        """
+        Carrega o modelo do faster-whisper na primeira chamada e o retorna (bloqueante; roda no executor).
+        Retorna None se não for possível baixá-lo ou carregá-lo; a próxima chamada tenta de novo.
+        """
+        with self.modelo_whisper_lock:
+            if self.modelo_whisper is None:
+                try:
+                    self.modelo_whisper = WhisperModel(MODELO_WHISPER, compute_type="int8")
+                except Exception as e:
+                    print(f"[ERRO RECONHECIMENTO] Não foi possível carregar o modelo do Whisper: {e}")
+            return self.modelo_whisper
 
     def ouvir_comando(self) -> str:
         """
         Ouve o comando de voz do usuário usando o microfone e o reconhece.
         Retorna o comando reconhecido em minúsculas.
         """
-        with sr.Microphone() as source:
-            print("[MIC] Ouvindo...")
-            try:
-                # Ajusta para o ruído ambiente para melhor reconhecimento
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.8)
-                # Ouve o áudio do microfone
-                audio = self.recognizer.listen(source, timeout=4, phrase_time_limit=5)
-                # Reconhece o áudio usando o Google Speech Recognition em português
-                comando = self.recognizer.recognize_google(audio, language="pt-BR").lower()
-                print(f"[COMANDO] {comando}")
-                return comando
-            except sr.WaitTimeoutError:
-                print("[ERRO RECONHECIMENTO] Nenhuma fala detectada.")
+        if self.fonte_microfone is None:
+            print("[ERRO MIC] Microfone indisponível.")
+            return ""
+        modelo_whisper = self._carregar_modelo_whisper()
+        if modelo_whisper is None:
+            return ""
+        print("[MIC] Ouvindo...")
+        try:
+            audio = self._escutar()
+            if audio is None:
+                print("[ERRO MIC] Microfone indisponível.")
                 return ""
-            except sr.UnknownValueError:
+            # Converte para PCM mono de 16 kHz em float32, o formato esperado pelo Whisper
+            pcm = audio.get_raw_data(convert_rate=TAXA_AMOSTRAGEM_ASR, convert_width=2)
+            amostras = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+            # Reconhece o áudio localmente com o faster-whisper em português,
+            # com as opções de menor latência (busca gulosa, sem contexto anterior)
+            segmentos, _ = modelo_whisper.transcribe(
+                amostras,
+                language="pt",
+                beam_size=1,
+                condition_on_previous_text=False,
+                vad_filter=True,
+            )
+            comando = " ".join(segmento.text.strip() for segmento in segmentos).lower()
+            if not comando:
                 print("[ERRO RECONHECIMENTO] Não foi possível entender o áudio.")
                 return ""
-            except sr.RequestError as e:
-                print(f"[ERRO RECONHECIMENTO] Erro de serviço de reconhecimento de fala; {e}")
-                return ""
-            except Exception as e:
-                print(f"[ERRO RECONHECIMENTO] Ocorreu um erro inesperado: {e}")
-                return ""
-
-    async def mover_para(self, destino: Tuple[int, int]):
-        """
-        Move a posição atual do usuário no mapa em direção ao destino,
-        fornecendo instruções de voz a cada passo, evitando prateleiras.
-        """
-        x_start, y_start = self.posicao_atual
-        x_product, y_product = destino # Localização original do produto
-
-        # Determinar o destino real para o BFS
-        # Se o produto está em uma prateleira, encontrar uma célula adjacente não-prateleira
-        final_destination = (x_product, y_product)
-        if (x_product, y_product) in self.prateleiras:
-            found_adjacent = False
-            # Tentar encontrar uma célula adjacente válida (não-prateleira)
-            for dx_adj, dy_adj in [(0, 1), (0, -1), (1, 0), (-1, 0)]: # Vizinhos: baixo, cima, direita, esquerda
-                adj_x, adj_y = x_product + dx_adj, y_product + dy_adj
-                if (0 <= adj_x < self.largura and
-                    0 <= adj_y < self.altura and
-                    (adj_x, adj_y) not in self.prateleiras):
-                    final_destination = (adj_x, adj_y)
-                    found_adjacent = True
-                    break
-            if not found_adjacent:
-                await self.sintetizar_voz("Não foi possível encontrar um local acessível para este produto.")
-                return
-
-        # Implementar BFS para encontrar o caminho mais curto até final_destination
-        queue = collections.deque([(x_start, y_start, [])])  # (x, y, caminho_percorrido)
-        visited = set([(x_start, y_start)])
-
-        path_found = None
-
-        while queue:
-            current_x, current_y, path_taken = queue.popleft()
-
-            if (current_x, current_y) == final_destination:
-                path_found = path_taken + [(current_x, current_y)]
-                break
-
-            # Possíveis movimentos: cima, baixo, esquerda, direita
-            moves = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-
-            for dx, dy in moves:
-                next_x, next_y = current_x + dx, current_y + dy
+            print(f"[COMANDO] {comando}")
+            return comando
+        except sr.WaitTimeoutError:
+            print("[ERRO RECONHECIMENTO] Nenhuma fala detectada.")
+            return ""
+        except Exception as e:
+            print(f"[ERRO RECONHECIMENTO] Ocorreu um erro inesperado: {e}")
+            return ""
 
-                # Verificar se o próximo movimento é válido (dentro dos limites, não é uma prateleira e não visitado)
-                if (0 <= next_x < self.largura and
-                    0 <= next_y < self.altura and
-                    (next_x, next_y) not in self.prateleiras and # Verifica se não é uma prateleira
-                    (next_x, next_y) not in visited):
+    async def mover_para(self, destino: int):
+        """
+        Move a posição atual do usuário no mapa em direção ao destino, evitando prateleiras,
+        com uma instrução de voz por trecho reto do caminho (ex.: "Siga 4 passos para a direita").
+        """
+        final_destination = self._destino_acessivel(destino)
+        if final_destination is None:
+            await self.sintetizar_voz("Não foi possível encontrar um local acessível para este produto.")
+            return
 
-                    visited.add((next_x, next_y))
-                    queue.append((next_x, next_y, path_taken + [(current_x, current_y)]))
+        tabela = self.proximo_passo.get(final_destination)
+        if tabela is not None:
+            # Rota pré-calculada em iniciar(): basta seguir a tabela a partir da posição atual
+            path_found = [self.posicao_atual]
+            while path_found[-1] != final_destination and tabela[path_found[-1]] != -1:
+                path_found.append(tabela[path_found[-1]])
+            if path_found[-1] != final_destination:
+                path_found = None
+        else:
+            # Caminho mais curto até final_destination (memoizado, pois o mapa é estático)
+            path_found = _caminho_mais_curto(
+                self.passavel, self.largura, self.altura, self.posicao_atual, final_destination
+            )
 
         if not path_found:
             await self.sintetizar_voz("Não foi possível encontrar um caminho para o produto.")
             return
 
-        # Seguir o caminho encontrado
+        # Agrupa os passos consecutivos na mesma direção em trechos: [(direção, quantidade de passos)]
+        trechos = []
         for i in range(1, len(path_found)):
-            prev_x, prev_y = path_found[i-1]
-            current_x, current_y = path_found[i]
-
-            # Determinar a direção para o comando de voz
-            if current_x > prev_x:
-                direction_text = "Siga para a direita"
-            elif current_x < prev_x:
-                direction_text = "Siga para a esquerda"
-            elif current_y > prev_y:
-                direction_text = "Siga em frente"
-            elif current_y < prev_y:
-                direction_text = "Volte"
+            direcao = path_found[i] - path_found[i-1]
+            if trechos and trechos[-1][0] == direcao:
+                trechos[-1][1] += 1
             else:
-                direction_text = "" # Não deve acontecer se o caminho tiver passos distintos
-
-            if direction_text: # Apenas sintetiza se houver uma direção válida
-                await self.sintetizar_voz(direction_text)
-
-            self.posicao_atual = (current_x, current_y)
-            self.desenhar_mapa()
-            await asyncio.sleep(0.5)
+                trechos.append([direcao, 1])
+        instrucoes = [self.instrucoes_direcao[direcao][passos - 1] for direcao, passos in trechos]
+
+        # Seguir o caminho encontrado com uma instrução de voz por trecho,
+        # já sintetizando as próximas frases enquanto a atual toca
+        sinteses = {}  # Texto -> tarefa de síntese (frases repetidas são geradas uma única vez)
+        passo = 0
+        for i, (direcao, passos) in enumerate(trechos):
+            for proximo_texto in instrucoes[i:i+3]:  # Frase atual e as duas seguintes
+                if proximo_texto not in sinteses:
+                    sinteses[proximo_texto] = asyncio.create_task(self.gerar_audio(proximo_texto))
+
+            await self.falar_preparado(instrucoes[i], sinteses[instrucoes[i]])
+
+            # Avança o usuário célula a célula pelo trecho, sem novas instruções de voz
+            for _ in range(passos):
+                passo += 1
+                self.posicao_atual = path_found[passo]
+                # O canvas só pode ser alterado pela thread do Tkinter, que lê esta fila
+                self.fila_canvas.put(self.posicao_atual)
+                await asyncio.sleep(0.5)
 
         await self.sintetizar_voz(f"Você chegou ao seu destino.")
 
 
+    def encontrar_produto(self, comando: str) -> Optional[str]:
+        """
+        Retorna o nome do primeiro produto mencionado no comando, ou None se nenhum for reconhecido.
+        O comando é dividido em palavras uma única vez (sem pontuação e sem acentos),
+        e cada palavra é consultada no conjunto de produtos.
+        """
+        sem_acentos = "".join(
+            c for c in unicodedata.normalize("NFKD", comando) if not unicodedata.combining(c)
+        )
+        palavras = "".join(c if c.isalnum() else " " for c in sem_acentos).split()
+        for palavra in palavras:
+            if palavra in self.produto_set:
+                return palavra
+
+        # Nomes com mais de uma palavra não aparecem como palavra isolada; verifica por substring
+        frase = " ".join(palavras)
+        for produto_nome in self.produtos_compostos:
+            if produto_nome in frase:
+                return produto_nome
+        return None
+
     async def executar_assistente(self):
         """
         Loop principal do assistente de voz. Ouve comandos, encontra produtos
@@ -311,21 +898,21 @@ class SupermercadoComAssistente:
         await self.sintetizar_voz("Assistente ativado. Qual produto você quer encontrar?")
 
         while True:
-            comando = self.ouvir_comando()
+            # Escuta em uma thread separada, para que sínteses em andamento continuem enquanto o usuário fala
+            comando = await self.loop.run_in_executor(None, self.ouvir_comando)
             if "sair" in comando:
                 await self.sintetizar_voz("Saindo do assistente. Até mais!")
                 break
 
-            produto_encontrado = False
-            for produto_nome, coords in self.produtos.items():
-                if produto_nome in comando:
-                    await self.sintetizar_voz(f"{produto_nome} encontrado. Direcionando você agora.")
-                    await self.mover_para(coords)
-                    await self.sintetizar_voz(f"Você chegou ao {produto_nome}. Deseja outro item?")
-                    produto_encontrado = True
-                    break
-
-            if not produto_encontrado and comando: # Se houve comando, mas não produto
+            produto_nome = self.encontrar_produto(comando)
+            if produto_nome is not None:
+                await self.sintetizar_voz(f"{produto_nome} encontrado. Direcionando você agora.")
+                # Sintetiza a mensagem de chegada enquanto o usuário é guiado
+                chegada = f"Você chegou ao {produto_nome}. Deseja outro item?"
+                sintese_chegada = asyncio.create_task(self.gerar_audio(chegada))
+                await self.mover_para(self.produtos[produto_nome])
+                await self.falar_preparado(chegada, sintese_chegada)
+            elif comando: # Se houve comando, mas não produto
                 await self.sintetizar_voz("Produto não encontrado ou comando inválido. Tente novamente.")
 
     def iniciar(self):
@@ -333,22 +920,15 @@ class SupermercadoComAssistente:
         Inicia a aplicação, configurando o mapa e iniciando o loop principal do Tkinter.
         """
         self.adicionar_prateleiras()
+        self.calcular_rotas()
         self.desenhar_mapa()
-        # Agenda a execução das tarefas assíncronas periodicamente para integrar com o Tkinter
-        self._process_async_events() # Chamada inicial
+        self._aplicar_posicoes()  # Passa a desenhar os movimentos enviados pelo assistente
+        # Pré-sintetiza as frases repetidas em segundo plano, sem atrasar a abertura da janela
+        asyncio.run_coroutine_threadsafe(self.pre_sintetizar_frases(), self.loop)
+        # Carrega o modelo do Whisper em uma thread do executor, para o primeiro comando não esperar por ele
+        self.loop.call_soon_threadsafe(self.loop.run_in_executor, None, self._carregar_modelo_whisper)
         self.janela.mainloop()
 
-    def _process_async_events(self):
-        """
-        Processa tarefas assíncronas pendentes sem bloquear o mainloop do Tkinter.
-        Esta função é chamada periodicamente pelo método after do Tkinter.
-        """
-        # Executa as tarefas pendentes do loop asyncio até que não haja mais tarefas prontas
-        # ou até que o tempo limite seja atingido (0 segundos, para não bloquear).
-        self.loop.call_soon(self.loop.stop)
-        self.loop.run_forever() # Executa até que `stop()` seja chamado, que ocorre imediatamente após processar as tarefas prontas.
-        self.janela.after(10, self._process_async_events) # Agenda a próxima verificação após 10ms
-
 
 if __name__ == "__main__":
     app = SupermercadoComAssistente()